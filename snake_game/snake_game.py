@@ -1,11 +1,14 @@
 import pygame
+import pygame.freetype
+import os
 import sys
+import atexit
 import random
 from collections import deque
 
 # Initialize Pygame
 pygame.init()
-pygame.font.init()
+pygame.freetype.init()
 
 # Constants
 WINDOW_WIDTH = 800
@@ -13,6 +16,22 @@ WINDOW_HEIGHT = 600
 GRID_SIZE = 20
 GRID_WIDTH = WINDOW_WIDTH // GRID_SIZE
 GRID_HEIGHT = WINDOW_HEIGHT // GRID_SIZE
+ALL_CELLS = [(x, y) for x in range(GRID_WIDTH) for y in range(GRID_HEIGHT)]
+
+# Movement directions as (dx, dy): right, down, left, up. Opposite directions are two
+# slots apart, so two indices are opposite exactly when they differ only in bit 1
+DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+DIRECTION_INDEX = {direction: i for i, direction in enumerate(DIRECTIONS)}
+
+# Neighbour of every cell in each direction, wrapping around the edges. Neighbours are the
+# tuples from ALL_CELLS itself, so the body only ever holds references to these 1200 objects
+NEXT_CELL = {
+    cell: tuple(
+        ALL_CELLS[(cell[0] + dx) % GRID_WIDTH * GRID_HEIGHT + (cell[1] + dy) % GRID_HEIGHT]
+        for dx, dy in DIRECTIONS
+    )
+    for cell in ALL_CELLS
+}
 
 # Difficulty settings (frames per second)
 DIFFICULTIES = {
@@ -27,91 +46,285 @@ GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 WHITE = (255, 255, 255)
 
+# High score file, relative to the working directory
+HIGHSCORE_PATH = 'highscore.txt'
+
+
+# Screen rect of every grid cell, built once so drawing never allocates Rects
+CELL_RECTS = [
+    [pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE) for y in range(GRID_HEIGHT)]
+    for x in range(GRID_WIDTH)
+]
+
+def _make_move(next_cell):
+    # Specialize Snake.move for the fixed grid: the neighbour table is a closure cell rather
+    # than a global lookup, and the body deque is read directly instead of via the property
+    def move(self):
+        if not self.alive:
+            return
+
+        # Update direction
+        direction_idx = self.direction_idx = self.next_direction_idx
+
+        # Look up new head position
+        body = self._body
+        new_head = next_cell[body[0]][direction_idx]
+
+        # Check for collision with self (the tail moves out of the way unless growing)
+        grid = self.grid
+        x, y = new_head
+        tail = body[-1]
+        if grid[x][y] and (self.growing or new_head != tail):
+            self.alive = False
+            return
+
+        # Add new head
+        body.appendleft(new_head)
+        if not grid[x][y]:
+            grid[x][y] = 1
+            self._occupy(new_head)
+
+        # Remove tail if not growing, and report the cell it vacated
+        if not self.growing:
+            body.pop()
+            if tail != new_head:
+                grid[tail[0]][tail[1]] = 0
+                self._vacate(tail)
+                return tail
+        else:
+            self.growing = False
+            self.length += 1
 
-# Set up the game window
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption('Snake Game')
-clock = pygame.time.Clock()
+    return move
 
 class Snake:
+    # Fixed attribute slots make attribute access on the hot move path cheaper than a __dict__
+    __slots__ = (
+        '_seg_surf', '_body', 'grid', 'free_cells', '_free_slots', 'direction_idx',
+        'next_direction_idx', 'length', 'growing', 'alive', 'difficulty'
+    )
+
     def __init__(self):
+        self._seg_surf = pygame.Surface((GRID_SIZE, GRID_SIZE))
+        self._seg_surf.fill(GREEN)
         self.reset()
 
     def reset(self):
-        self.body = deque([(GRID_WIDTH // 2, GRID_HEIGHT // 2)])
-        self.direction = (1, 0)  # Start moving right
+        # Start from the pooled center cell so the free-cell list only ever holds ALL_CELLS tuples
+        self.body = deque([ALL_CELLS[GRID_WIDTH // 2 * GRID_HEIGHT + GRID_HEIGHT // 2]])
+        self.direction_idx = 0  # Start moving right
         self.length = 1
-        self.next_direction = self.direction
+        self.next_direction_idx = self.direction_idx
         self.growing = False
         self.alive = True
         self.difficulty = 'Medium'  # Default difficulty
 
+    @property
+    def direction(self):
+        return DIRECTIONS[self.direction_idx]
+
+    @direction.setter
+    def direction(self, direction):
+        self.direction_idx = DIRECTION_INDEX[direction]
+
+    @property
+    def next_direction(self):
+        return DIRECTIONS[self.next_direction_idx]
+
+    @next_direction.setter
+    def next_direction(self, direction):
+        self.next_direction_idx = DIRECTION_INDEX[direction]
+
+    @property
+    def body(self):
+        return self._body
+
+    @body.setter
+    def body(self, body):
+        # Keep an occupancy grid (grid[x][y] is 1 under the snake) alongside the deque
+        self._body = body
+        self.grid = [bytearray(GRID_HEIGHT) for _ in range(GRID_WIDTH)]
+        for x, y in body:
+            self.grid[x][y] = 1
+        # Free cells are kept in a list (for uniform sampling) plus a slot index (for O(1) removal)
+        self.free_cells = [cell for cell in ALL_CELLS if not self.grid[cell[0]][cell[1]]]
+        self._free_slots = {cell: slot for slot, cell in enumerate(self.free_cells)}
+
+    def _occupy(self, cell):
+        # Swap-remove the cell from the free list
+        slot = self._free_slots.pop(cell)
+        last = self.free_cells.pop()
+        if last != cell:
+            self.free_cells[slot] = last
+            self._free_slots[last] = slot
+
+    def _vacate(self, cell):
+        self._free_slots[cell] = len(self.free_cells)
+        self.free_cells.append(cell)
+
     def change_direction(self, new_direction):
         # Prevent 180-degree turns
-        if (self.direction[0] + new_direction[0], self.direction[1] + new_direction[1]) != (0, 0):
-            self.next_direction = new_direction
+        new_idx = DIRECTION_INDEX[new_direction]
+        if new_idx ^ self.direction_idx != 2:
+            self.next_direction_idx = new_idx
 
-    def move(self):
-        if not self.alive:
-            return
+    # Built by _make_move() with the neighbour table bound as a closure variable
+    move = _make_move(NEXT_CELL)
 
-        # Update direction
-        self.direction = self.next_direction
-        
-        # Get current head position
-        head_x, head_y = self.body[0]
-        
-        # Calculate new head position
-        new_head = (
-            (head_x + self.direction[0]) % GRID_WIDTH,
-            (head_y + self.direction[1]) % GRID_HEIGHT
-        )
-        
-        # Check for collision with self
-        if new_head in list(self.body)[1:]:
-            self.alive = False
-            return
+    def move_n(self, directions):
+        # Run one steered tick per direction for headless play, stopping once the snake
+        # dies. Returns the number of ticks taken
+        move = self.move
+        change_direction = self.change_direction
+        ticks = 0
+        for direction in directions:
+            if not self.alive:
+                break
+            change_direction(direction)
+            move()
+            ticks += 1
+        return ticks
 
-        # Add new head
-        self.body.appendleft(new_head)
-        
-        # Remove tail if not growing
-        if not self.growing:
-            self.body.pop()
+    def draw(self, screen):
+        # Blit every segment in one batched call instead of one draw call per segment
+        seg_surf = self._seg_surf
+        screen.blits([(seg_surf, CELL_RECTS[x][y]) for x, y in self.body], doreturn=0)
+
+def spawn_food(free_cells):
+    # Sample uniformly from the free cells, so placement cost doesn't grow as the board fills up
+    if not free_cells:
+        raise ValueError('No free cells left to place food')
+    return free_cells[random.randrange(len(free_cells))]
+
+def step(snake, food_position):
+    # Advance the game by one tick without touching the display, so it can also be driven headlessly
+    vacated = snake.move()
+    if snake.alive and snake.body[0] == food_position:
+        if snake.free_cells:
+            snake.growing = True
+            food_position = spawn_food(snake.free_cells)
         else:
-            self.growing = False
-            self.length += 1
+            # The snake fills the board, so there is nowhere left for food: the round is won
+            snake.length += 1
+            snake.alive = False
+            food_position = None
+    return vacated, food_position
 
-    def draw(self, screen):
-        for segment in self.body:
-            x, y = segment
-            rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            pygame.draw.rect(screen, GREEN, rect)
+# Rendered surfaces for text that never changes, keyed by string
+TEXT_CACHE = {}
+
+def render_text(font, text):
+    surface = TEXT_CACHE.get(text)
+    if surface is None:
+        surface = TEXT_CACHE[text] = font.render(text, WHITE)[0]
+    return surface
+
+# Last high score read from or written to disk; None until first loaded
+_high_score = None
 
 def load_high_score():
-    try:
-        with open('highscore.txt', 'r') as f:
-            return int(f.read())
-    except:
-        return 0
+    global _high_score
+    if _high_score is None:
+        # The file only holds a short integer, so read raw bytes without the text I/O stack
+        try:
+            fd = os.open(HIGHSCORE_PATH, os.O_RDONLY)
+            try:
+                _high_score = int(os.read(fd, 32))
+            finally:
+                os.close(fd)
+        except (FileNotFoundError, ValueError):
+            _high_score = 0
+    return _high_score
 
 def save_high_score(score):
-    with open('highscore.txt', 'w') as f:
+    global _high_score
+    # Skip the write when the file already holds this score
+    if score == _high_score:
+        return
+    with open(HIGHSCORE_PATH, 'w') as f:
         f.write(str(score))
+    _high_score = score
+
+def compose_text(lines):
+    # Pre-compose (surface, position) text lines into one transparent surface, returned with its position
+    rects = [surface.get_rect(topleft=position) for surface, position in lines]
+    bounds = rects[0].unionall(rects[1:])
+    composed = pygame.Surface(bounds.size, pygame.SRCALPHA)
+    for (surface, _), rect in zip(lines, rects):
+        # Copy pixels and alpha as-is instead of alpha-blending onto the empty surface
+        composed.blit(surface, rect.move(-bounds.x, -bounds.y), special_flags=pygame.BLEND_RGBA_MAX)
+    return composed, bounds.topleft
+
+def draw_cell(screen, cell, snake, food_position):
+    if snake.grid[cell[0]][cell[1]]:
+        color = GREEN
+    elif cell == food_position:
+        color = RED
+    else:
+        color = BLACK
+    rect = CELL_RECTS[cell[0]][cell[1]]
+    screen.fill(color, rect)
+    return rect
+
+def draw_region(screen, region, snake, food_position):
+    # Repaint the board cells under a screen region, e.g. before redrawing the HUD on top
+    for x in range(region.left // GRID_SIZE, min((region.right - 1) // GRID_SIZE + 1, GRID_WIDTH)):
+        for y in range(region.top // GRID_SIZE, min((region.bottom - 1) // GRID_SIZE + 1, GRID_HEIGHT)):
+            draw_cell(screen, (x, y), snake, food_position)
 
 def main():
+    # Set up the game window
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption('Snake Game')
+    # Only queue the events the game handles, so e.g. mouse motion never allocates Event objects
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED])
+
     snake = Snake()
-    food_position = spawn_food(snake.body)
-    font = pygame.font.SysFont('arial', 24)
+    food_position = spawn_food(snake.free_cells)
+    food_surf = pygame.Surface((GRID_SIZE, GRID_SIZE))
+    food_surf.fill(RED)
+    font = pygame.freetype.SysFont('arial', 24)
     high_score = load_high_score()
+    high_score_dirty = False
     show_difficulty_menu = True
 
+    # Only changed cells and the HUD are redrawn each tick; the whole frame is
+    # redrawn when switching between the menu, gameplay and game over screens
+    full_redraw = True
+
+    # The HUD is rendered into one persistent surface, only when one of its values changes
+    hud_surf = pygame.Surface((300, 90), pygame.SRCALPHA)
+    hud_rect = hud_surf.get_rect(topleft=(10, 10))
+    rendered_hud = None
+
+    # The difficulty menu never changes, so compose it into a single surface once
+    menu_surf, menu_pos = compose_text([
+        (render_text(font, 'Select Difficulty:'), (WINDOW_WIDTH/2 - 100, WINDOW_HEIGHT/2 - 60)),
+        (render_text(font, '1 - Easy'), (WINDOW_WIDTH/2 - 50, WINDOW_HEIGHT/2 - 20)),
+        (render_text(font, '2 - Medium'), (WINDOW_WIDTH/2 - 50, WINDOW_HEIGHT/2 + 10)),
+        (render_text(font, '3 - Hard'), (WINDOW_WIDTH/2 - 50, WINDOW_HEIGHT/2 + 40)),
+    ])
+
+    # Persist a new high score once on game over, or on exit if the game is quit mid-run
+    def flush_high_score():
+        if high_score_dirty:
+            save_high_score(high_score)
+
+    atexit.register(flush_high_score)
+
+    # Game time not yet consumed by a tick, in milliseconds
+    accumulator = 0
+    last_ticks = pygame.time.get_ticks()
+
     # Game loop
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                full_redraw = True
             elif event.type == pygame.KEYDOWN:
                 if show_difficulty_menu:
                     if event.key == pygame.K_1:
@@ -123,44 +336,50 @@ def main():
                     elif event.key == pygame.K_3:
                         snake.difficulty = 'Hard'
                         show_difficulty_menu = False
+                    if not show_difficulty_menu:
+                        full_redraw = True
                 elif not snake.alive and event.key == pygame.K_SPACE:
                     snake.reset()
-                    food_position = spawn_food(snake.body)
+                    food_position = spawn_food(snake.free_cells)
                     show_difficulty_menu = True
+                    full_redraw = True
+                elif snake.alive:
+                    # Handle keyboard input
+                    if event.key == pygame.K_UP:
+                        snake.change_direction((0, -1))
+                    elif event.key == pygame.K_DOWN:
+                        snake.change_direction((0, 1))
+                    elif event.key == pygame.K_LEFT:
+                        snake.change_direction((-1, 0))
+                    elif event.key == pygame.K_RIGHT:
+                        snake.change_direction((1, 0))
 
-        # Handle keyboard input
-        if snake.alive and not show_difficulty_menu:
-            keys = pygame.key.get_pressed()
-            if keys[pygame.K_UP]:
-                snake.change_direction((0, -1))
-            elif keys[pygame.K_DOWN]:
-                snake.change_direction((0, 1))
-            elif keys[pygame.K_LEFT]:
-                snake.change_direction((-1, 0))
-            elif keys[pygame.K_RIGHT]:
-                snake.change_direction((1, 0))
-        
-        # Move the snake
-        snake.move()
-        
-        # Check if snake ate food
-        if snake.alive and snake.body[0] == food_position:
-            snake.growing = True
-            food_position = spawn_food(snake.body)
-        
-        # Clear the screen
-        screen.fill(BLACK)
-        
-        # Draw the food
-        food_rect = pygame.Rect(
-            food_position[0] * GRID_SIZE,
-            food_position[1] * GRID_SIZE,
-            GRID_SIZE, GRID_SIZE
-        )
-        pygame.draw.rect(screen, RED, food_rect)
-        
-        # Draw the snake
-        snake.draw(screen)
+        # Advance the game only once a full tick (based on difficulty) has elapsed
+        playing = snake.alive and not show_difficulty_menu
+        now = pygame.time.get_ticks()
+        tick_ms = 1000 / DIFFICULTIES[snake.difficulty]
+        accumulator = min(accumulator + now - last_ticks, 2 * tick_ms) if playing else 0
+        last_ticks = now
+
+        # Nothing to update yet: sleep until the next tick is due instead of spinning
+        if accumulator < tick_ms and not full_redraw:
+            pygame.time.wait(int(tick_ms - accumulator))
+            continue
+
+        # Move the snake, collecting the cells that changed
+        dirty_cells = []
+        if playing and accumulator >= tick_ms:
+            accumulator -= tick_ms
+            vacated, new_food_position = step(snake, food_position)
+            if not snake.alive:
+                full_redraw = True
+            else:
+                dirty_cells.append(snake.body[0])
+                if vacated is not None:
+                    dirty_cells.append(vacated)
+                if new_food_position != food_position:
+                    dirty_cells.append(new_food_position)
+            food_position = new_food_position
         
         # Calculate current score
         current_score = snake.length - 1
@@ -168,47 +387,68 @@ def main():
         # Update high score if needed
         if current_score > high_score:
             high_score = current_score
-            save_high_score(high_score)
-        
-        if show_difficulty_menu:
-            # Draw difficulty selection menu
-            title_text = font.render('Select Difficulty:', True, WHITE)
-            easy_text = font.render('1 - Easy', True, WHITE)
-            medium_text = font.render('2 - Medium', True, WHITE)
-            hard_text = font.render('3 - Hard', True, WHITE)
+            high_score_dirty = True
+
+        hud_values = (current_score, high_score, snake.difficulty)
+        hud_changed = hud_values != rendered_hud
+        if hud_changed:
+            hud_surf.fill((0, 0, 0, 0))
+            font.render_to(hud_surf, (0, 0), f'Score: {current_score}', WHITE)
+            font.render_to(hud_surf, (0, 30), f'High Score: {high_score}', WHITE)
+            font.render_to(hud_surf, (0, 60), f'Difficulty: {snake.difficulty}', WHITE)
+            rendered_hud = hud_values
+
+        if full_redraw:
+            # Clear the screen
+            screen.fill(BLACK)
             
-            screen.blit(title_text, (WINDOW_WIDTH/2 - 100, WINDOW_HEIGHT/2 - 60))
-            screen.blit(easy_text, (WINDOW_WIDTH/2 - 50, WINDOW_HEIGHT/2 - 20))
-            screen.blit(medium_text, (WINDOW_WIDTH/2 - 50, WINDOW_HEIGHT/2 + 10))
-            screen.blit(hard_text, (WINDOW_WIDTH/2 - 50, WINDOW_HEIGHT/2 + 40))
-        else:
-            # Draw scores and difficulty
-            score_text = font.render(f'Score: {current_score}', True, WHITE)
-            high_score_text = font.render(f'High Score: {high_score}', True, WHITE)
-            difficulty_text = font.render(f'Difficulty: {snake.difficulty}', True, WHITE)
-            screen.blit(score_text, (10, 10))
-            screen.blit(high_score_text, (10, 40))
-            screen.blit(difficulty_text, (10, 70))
-        
-        # Draw game over message
-        if not snake.alive:
-            game_over_text = font.render('Game Over!', True, WHITE)
-            final_score_text = font.render(f'Final Score: {current_score}', True, WHITE)
-            restart_text = font.render('Press SPACE to restart', True, WHITE)
+            # Draw the food (there is none once the snake has filled the board)
+            if food_position is not None:
+                screen.blit(food_surf, CELL_RECTS[food_position[0]][food_position[1]])
             
-            game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 - 40))
-            final_score_rect = final_score_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
-            restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 40))
+            # Draw the snake
+            snake.draw(screen)
             
-            screen.blit(game_over_text, game_over_rect)
-            screen.blit(final_score_text, final_score_rect)
-            screen.blit(restart_text, restart_rect)
-        
-        # Update the display
-        pygame.display.flip()
-        
-        # Control game speed based on difficulty
-        clock.tick(DIFFICULTIES[snake.difficulty])
+            if show_difficulty_menu:
+                # Draw difficulty selection menu
+                screen.blit(menu_surf, menu_pos)
+            else:
+                # Draw scores and difficulty
+                screen.blit(hud_surf, hud_rect)
+            
+            # Draw game over message
+            if not snake.alive:
+                if high_score_dirty:
+                    save_high_score(high_score)
+                    high_score_dirty = False
+
+                game_over_text = render_text(font, 'Game Over!' if food_position is not None else 'You Win!')
+                final_score_text = font.render(f'Final Score: {current_score}', WHITE)[0]
+                restart_text = render_text(font, 'Press SPACE to restart')
+                
+                game_over_rect = game_over_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 - 40))
+                final_score_rect = final_score_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2))
+                restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH/2, WINDOW_HEIGHT/2 + 40))
+                
+                screen.blit(game_over_text, game_over_rect)
+                screen.blit(final_score_text, final_score_rect)
+                screen.blit(restart_text, restart_rect)
+            
+            # Update the whole display
+            pygame.display.flip()
+            full_redraw = False
+        elif dirty_cells:
+            # Redraw only the cells that changed
+            dirty_rects = [draw_cell(screen, cell, snake, food_position) for cell in dirty_cells]
+
+            # The HUD is drawn over the board, so repaint it if its text changed or a cell under it did
+            if hud_changed or hud_rect.collidelist(dirty_rects) != -1:
+                draw_region(screen, hud_rect, snake, food_position)
+                screen.blit(hud_surf, hud_rect)
+                dirty_rects.append(hud_rect)
+
+            # Update only the changed parts of the display
+            pygame.display.update(dirty_rects)
 
 if __name__ == '__main__':
     main()
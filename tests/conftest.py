@@ -0,0 +1,68 @@
+import sys
+import types
+from collections import deque
+from unittest.mock import patch
+
+import pytest
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+def _pygame_stubs():
+    """Build bare module stand-ins for the pygame calls snake_game makes at import time.
+
+    Rects come back as their argument tuples so each cell keeps a distinct,
+    comparable rect; surfaces only need fill().
+    """
+    freetype = types.ModuleType("pygame.freetype")
+    freetype.init = _noop
+
+    pygame = types.ModuleType("pygame")
+    pygame.__path__ = []  # a package, like the real pygame
+    pygame.init = _noop
+    pygame.freetype = freetype
+    pygame.Rect = lambda *args: args
+    pygame.Surface = lambda *args, **kwargs: types.SimpleNamespace(fill=_noop)
+    return {"pygame": pygame, "pygame.freetype": freetype}
+
+
+@pytest.fixture(scope="session")
+def snake_game():
+    """Import snake_game once against the pygame stubs, leaving sys.modules untouched."""
+    with patch.dict(sys.modules, _pygame_stubs()):
+        import snake_game as sg
+
+    return sg
+
+
+@pytest.fixture(scope="session")
+def expected_center(snake_game):
+    """The grid cell every new or reset snake starts from."""
+    return (snake_game.GRID_WIDTH // 2, snake_game.GRID_HEIGHT // 2)
+
+
+@pytest.fixture(scope="session")
+def _shared_snake(snake_game):
+    return snake_game.Snake()
+
+
+@pytest.fixture
+def snake(_shared_snake):
+    """A Snake in its initial state, reused across tests and reset before each one."""
+    _shared_snake.reset()
+    return _shared_snake
+
+
+@pytest.fixture
+def two_cell_body():
+    """A fresh two-segment body heading right; Snake keeps the deque it is given."""
+    return deque([(5, 5), (4, 5)])
+
+
+@pytest.fixture
+def mock_randrange(snake_game):
+    """Patch the game's random.randrange, returning slot 0 unless a test overrides it."""
+    with patch.object(snake_game.random, "randrange", return_value=0) as mock:
+        yield mock
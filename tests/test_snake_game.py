@@ -1,98 +1,80 @@
 import pytest
-import sys
-import os
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, MagicMock
 from collections import deque
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "snake_game"))
+# Frame rate for each difficulty, shared by the constant and integration tests
+EXPECTED_DIFFICULTIES = {"Easy": 8, "Medium": 12, "Hard": 16}
 
-with patch.dict(
-    "sys.modules",
-    {
-        "pygame": MagicMock(),
-        "pygame.display": MagicMock(),
-        "pygame.font": MagicMock(),
-        "pygame.time": MagicMock(),
-        "pygame.draw": MagicMock(),
-    },
-):
-    import snake_game
+# Module-level constants and their expected values, one test case each
+EXPECTED_CONSTANTS = [
+    ("WINDOW_WIDTH", 800),
+    ("WINDOW_HEIGHT", 600),
+    ("GRID_SIZE", 20),
+    ("GRID_WIDTH", 40),
+    ("GRID_HEIGHT", 30),
+    ("DIFFICULTIES", EXPECTED_DIFFICULTIES),
+    ("BLACK", (0, 0, 0)),
+    ("GREEN", (0, 255, 0)),
+    ("RED", (255, 0, 0)),
+    ("WHITE", (255, 255, 255)),
+    ("HIGHSCORE_PATH", "highscore.txt"),
+]
 
 
-class TestSnakeGame:
-    """Test suite for the Snake game functionality."""
-
-    def test_constants(self):
-        """Test that game constants are properly defined and have expected values.
+def occupied_cells(snake):
+    """Return the set of cells marked as occupied in the snake's grid."""
+    return {(x, y) for x, column in enumerate(snake.grid) for y, cell in enumerate(column) if cell}
 
-        Validates that all window dimensions, grid settings, and layout constants
-        are correctly configured for the Snake game. These constants are critical
-        for proper game rendering and collision detection.
-
-        Assertions:
-            - WINDOW_WIDTH: Game window width in pixels (800)
-            - WINDOW_HEIGHT: Game window height in pixels (600)
-            - GRID_SIZE: Size of each grid cell in pixels (20)
-            - GRID_WIDTH: Number of grid cells horizontally (40)
-            - GRID_HEIGHT: Number of grid cells vertically (30)
-        """
-        assert snake_game.WINDOW_WIDTH == 800
-        assert snake_game.WINDOW_HEIGHT == 600
-        assert snake_game.GRID_SIZE == 20
-        assert snake_game.GRID_WIDTH == 40
-        assert snake_game.GRID_HEIGHT == 30
 
-    def test_difficulties(self):
-        """Test that difficulty settings are properly configured with correct FPS values.
+def _assert_initial_state(snake, expected_center):
+    """Assert that the snake is in the state a new game starts from."""
+    assert list(snake.body) == [expected_center]
+    assert occupied_cells(snake) == {expected_center}
 
-        Validates the DIFFICULTIES dictionary contains all expected difficulty levels
-        with their corresponding frames-per-second values. These settings control
-        the game speed and player experience.
+    assert snake.direction == (1, 0)
+    assert snake.length == 1
+    assert snake.next_direction == snake.direction
+    assert snake.growing is False
+    assert snake.alive is True
+    assert snake.difficulty == "Medium"
 
-        Expected difficulty mappings:
-            - Easy: 8 FPS (slower, beginner-friendly)
-            - Medium: 12 FPS (moderate speed)
-            - Hard: 16 FPS (faster, challenging)
 
-        Assertions:
-            - All three difficulty levels are present
-            - Each difficulty has the correct FPS value
-            - Dictionary structure matches expected format
-        """
-        expected_difficulties = {"Easy": 8, "Medium": 12, "Hard": 16}
-        assert snake_game.DIFFICULTIES == expected_difficulties
+class TestSnakeGame:
+    """Test suite for the Snake game functionality."""
 
-    def test_colors(self):
-        """Test that color constants are properly defined as RGB tuples.
+    @pytest.mark.parametrize(
+        "attr,expected", EXPECTED_CONSTANTS, ids=[attr for attr, _ in EXPECTED_CONSTANTS]
+    )
+    def test_constant(self, attr, expected, snake_game):
+        """Test that a game constant is defined with its expected value.
 
-        Validates that all game colors are correctly defined as RGB tuples
-        for consistent rendering across the game interface.
+        Validates window dimensions, grid settings, difficulty FPS values and
+        RGB colors in one table-driven test. Each (attr, expected) pair is
+        reported as its own test case.
 
-        Color definitions:
-            - BLACK: (0, 0, 0) - Background color
-            - GREEN: (0, 255, 0) - Snake body color
-            - RED: (255, 0, 0) - Food color
-            - WHITE: (255, 255, 255) - Text and UI elements
+        Constant groups:
+            - Window/grid: 800x600 window, 20px cells, 40x30 grid
+            - Difficulties: Easy 8, Medium 12, Hard 16 FPS
+            - Colors: BLACK background, GREEN snake, RED food, WHITE text
+            - High score file: highscore.txt in the working directory
 
         Assertions:
-            - Each color is a valid RGB tuple
-            - Color values match expected game design
+            - Module attribute equals the expected value
         """
-        assert snake_game.BLACK == (0, 0, 0)
-        assert snake_game.GREEN == (0, 255, 0)
-        assert snake_game.RED == (255, 0, 0)
-        assert snake_game.WHITE == (255, 255, 255)
+        assert getattr(snake_game, attr) == expected
 
 
 class TestSnake:
     """Test suite for the Snake class."""
 
-    def test_snake_initialization(self):
-        """Test Snake class initialization with default starting state.
+    @pytest.mark.parametrize("after_reset", [False, True], ids=["new", "reset"])
+    def test_snake_initial_state(self, after_reset, expected_center, snake_game):
+        """Test that a new or reset snake starts from the default state.
 
-        Validates that a new Snake instance is created with the correct initial
-        state including position, direction, size, and game status. The snake
-        should start at the center of the grid moving right.
+        Validates that a new Snake instance starts at the center of the grid
+        moving right, and that reset() restores that same state regardless
+        of the current game state. The latter is critical for the restart
+        functionality after game over.
 
         Initial state expectations:
             - Position: Center of the game grid
@@ -101,120 +83,76 @@ class TestSnake:
             - Status: Alive and not growing
             - Difficulty: Medium (default)
 
+        Reset procedure:
+            1. Modify body, direction, length, growth, alive and difficulty
+            2. Call reset() method
+            3. Verify all state returns to initial values
+
         Assertions:
             - Snake body contains exactly one segment at grid center
+            - Occupancy grid marks only that segment
             - Movement direction is rightward
             - All boolean flags are in correct initial state
             - Default difficulty is set
         """
         snake = snake_game.Snake()
 
-        expected_center = (snake_game.GRID_WIDTH // 2, snake_game.GRID_HEIGHT // 2)
-        assert snake.body[0] == expected_center
-        assert len(snake.body) == 1
-
-        assert snake.direction == (1, 0)
-        assert snake.length == 1
-        assert snake.next_direction == snake.direction
-        assert snake.growing is False
-        assert snake.alive is True
-        assert snake.difficulty == "Medium"
-
-    def test_snake_reset(self):
-        """Test Snake reset functionality returns to initial state.
-
-        Validates that the reset() method properly restores the snake to its
-        initial state regardless of current game state. This is critical for
-        the restart functionality after game over.
-
-        Test procedure:
-            1. Create snake and modify all state variables
-            2. Call reset() method
-            3. Verify all state returns to initial values
-
-        State changes tested:
-            - Body length and position
-            - Movement direction
-            - Growth and alive status
-            - Difficulty setting
+        if after_reset:
+            snake.body.append((10, 10))
+            snake.direction = (0, 1)
+            snake.length = 5
+            snake.growing = True
+            snake.alive = False
+            snake.difficulty = "Hard"
+            snake.reset()
+
+        _assert_initial_state(snake, expected_center)
+
+    @pytest.mark.parametrize(
+        "new_direction,expected",
+        [
+            ((0, -1), (0, -1)),
+            ((0, 1), (0, 1)),
+            ((1, 0), (1, 0)),
+            ((-1, 0), (1, 0)),
+        ],
+        ids=["up", "down", "same", "reverse"],
+    )
+    def test_change_direction(self, snake, new_direction, expected):
+        """Test which direction changes are accepted for a snake moving right.
+
+        Validates that perpendicular turns are stored in next_direction to be
+        applied on the next move, while a 180-degree turn (right to left) is
+        ignored, since it would cause immediate self-collision.
+
+        Direction changes tested (snake moving right (1, 0)):
+            - Up (0, -1) and Down (0, 1): accepted
+            - Right (1, 0): accepted, no change
+            - Left (-1, 0): rejected, next_direction stays rightward
 
         Assertions:
-            - All state variables return to initialization values
-            - Snake position resets to grid center
-            - Movement direction resets to rightward
+            - next_direction matches the expected direction
+            - Current direction is unchanged until the next move
         """
-        snake = snake_game.Snake()
+        snake.change_direction(new_direction)
 
-        snake.body.append((10, 10))
-        snake.direction = (0, 1)
-        snake.length = 5
-        snake.growing = True
-        snake.alive = False
-        snake.difficulty = "Hard"
-
-        snake.reset()
-        expected_center = (snake_game.GRID_WIDTH // 2, snake_game.GRID_HEIGHT // 2)
-        assert snake.body[0] == expected_center
-        assert len(snake.body) == 1
+        assert snake.next_direction == expected
         assert snake.direction == (1, 0)
-        assert snake.length == 1
-        assert snake.next_direction == snake.direction
-        assert snake.growing is False
-        assert snake.alive is True
-        assert snake.difficulty == "Medium"
 
-    def test_change_direction_valid(self):
-        """Test valid direction changes are accepted and stored.
+    def test_opposite_directions_xor(self, snake_game):
+        """Test that direction indices are opposite exactly when they xor to 2.
 
-        Validates that the snake can change direction to perpendicular directions
-        (up/down when moving horizontally). The direction change should be stored
-        in next_direction and applied on the next move.
-
-        Valid direction changes tested:
-            - Right to Up: (1, 0) to (0, -1)
-            - Right to Down: (1, 0) to (0, 1)
+        Validates the DIRECTIONS ordering that change_direction() relies on
+        to reject 180-degree turns with a single xor.
 
         Assertions:
-            - next_direction is updated with new direction
-            - Direction changes are accepted for perpendicular moves
-            - No immediate change to current direction (applied on next move)
+            - Two directions cancel out to (0, 0) iff their indices xor to 2
         """
-        snake = snake_game.Snake()
-
-        snake.change_direction((0, -1))
-        assert snake.next_direction == (0, -1)
-
-        snake.change_direction((0, 1))
-        assert snake.next_direction == (0, 1)
-
-    def test_change_direction_invalid_180_turn(self):
-        """Test that 180-degree turns are prevented to avoid self-collision.
+        for a, (dx, dy) in enumerate(snake_game.DIRECTIONS):
+            for b, (other_dx, other_dy) in enumerate(snake_game.DIRECTIONS):
+                assert ((dx + other_dx, dy + other_dy) == (0, 0)) == (a ^ b == 2)
 
-        Validates that the snake cannot reverse direction directly (e.g., from
-        right to left) as this would cause immediate self-collision. The game
-        should ignore such direction changes.
-
-        Test scenario:
-            - Snake moving right (1, 0)
-            - Attempt to change to left (-1, 0)
-            - Direction change should be ignored
-
-        Game logic:
-            - Prevents immediate self-collision
-            - Maintains game flow and fairness
-            - Common feature in Snake games
-
-        Assertions:
-            - next_direction remains unchanged
-            - Invalid direction change is ignored
-        """
-        snake = snake_game.Snake()
-        original_direction = snake.direction
-
-        snake.change_direction((-1, 0))
-        assert snake.next_direction == original_direction
-
-    def test_snake_movement_basic(self):
+    def test_snake_movement_basic(self, snake):
         """Test basic snake movement in the current direction.
 
         Validates that the snake moves one grid position in its current direction
@@ -235,7 +173,6 @@ class TestSnake:
             - New head position matches expected coordinates
             - Snake body length unchanged
         """
-        snake = snake_game.Snake()
         original_head = snake.body[0]
 
         snake.move()
@@ -245,7 +182,7 @@ class TestSnake:
         assert new_head == expected_head
         assert len(snake.body) == 1
 
-    def test_snake_movement_with_growth(self):
+    def test_snake_movement_with_growth(self, snake):
         """Test snake movement when growing flag is set (after eating food).
 
         Validates that when the growing flag is True, the snake adds a new head
@@ -265,20 +202,22 @@ class TestSnake:
 
         Assertions:
             - Snake length increases by 1
+            - Length counter matches the new body length
             - Growing flag resets to False
-            - New head added correctly
+            - New head added in the movement direction
         """
-        snake = snake_game.Snake()
+        original_head = snake.body[0]
         original_length = len(snake.body)
 
         snake.growing = True
         snake.move()
 
         assert len(snake.body) == original_length + 1
-        assert snake.length == 2
+        assert snake.length == original_length + 1
         assert snake.growing is False
+        assert snake.body[0] == (original_head[0] + 1, original_head[1])
 
-    def test_snake_wrapping(self):
+    def test_snake_wrapping(self, snake, snake_game):
         """Test that snake wraps around screen edges using modulo arithmetic.
 
         Validates that when the snake moves beyond the grid boundaries, it wraps
@@ -300,8 +239,6 @@ class TestSnake:
             - Snake position wraps correctly using modulo
             - No collision or game over from edge movement
         """
-        snake = snake_game.Snake()
-
         snake.body = deque([(snake_game.GRID_WIDTH - 1, 10)])
         snake.direction = (1, 0)
         snake.next_direction = (1, 0)
@@ -310,39 +247,184 @@ class TestSnake:
 
         assert snake.body[0] == (0, 10)
 
-    def test_snake_self_collision(self):
+    def test_next_cell_wraps_all_edges(self, snake_game):
+        """Test that the precomputed neighbour table wraps on every edge.
+
+        Validates that NEXT_CELL matches the modulo arithmetic it replaces,
+        for each of the four directions at the grid corners.
+
+        Assertions:
+            - Every cell has one neighbour per direction
+            - Corner neighbours wrap to the opposite edge
+        """
+        last_x = snake_game.GRID_WIDTH - 1
+        last_y = snake_game.GRID_HEIGHT - 1
+
+        assert len(snake_game.NEXT_CELL) == snake_game.GRID_WIDTH * snake_game.GRID_HEIGHT
+        assert snake_game.NEXT_CELL[(0, 0)] == ((1, 0), (0, 1), (last_x, 0), (0, last_y))
+        assert snake_game.NEXT_CELL[(last_x, last_y)] == (
+            (0, last_y),
+            (last_x, 0),
+            (last_x - 1, last_y),
+            (last_x, last_y - 1),
+        )
+
+    def test_next_cell_shares_cell_tuples(self, snake, snake_game):
+        """Test that neighbour lookups and free cells reuse the tuples from ALL_CELLS.
+
+        Validates that moving never creates new coordinate objects: every
+        neighbour in NEXT_CELL, every body segment and every free cell is the
+        same tuple object stored in ALL_CELLS, so cells are just references
+        into one fixed pool.
+
+        Assertions:
+            - Every neighbour is identical (not just equal) to an ALL_CELLS entry
+            - Free cells and body segments stay pooled as the snake moves,
+              including the tail cells it vacates
+        """
+        pool = {id(cell) for cell in snake_game.ALL_CELLS}
+
+        for neighbours in snake_game.NEXT_CELL.values():
+            assert all(id(cell) in pool for cell in neighbours)
+
+        def pooled(cell):
+            return cell is snake_game.ALL_CELLS[cell[0] * snake_game.GRID_HEIGHT + cell[1]]
+
+        for growing in (False, True, False):
+            assert all(pooled(cell) for cell in snake.free_cells)
+            assert all(pooled(cell) for cell in snake.body)
+            snake.growing = growing
+            snake.move()
+        assert all(pooled(cell) for cell in snake.free_cells)
+
+    @pytest.mark.parametrize(
+        "body,direction,growing,expected_alive",
+        [
+            ([(5, 5), (4, 5), (3, 5)], (-1, 0), False, False),
+            ([(5, 5), (5, 6), (4, 6), (4, 5), (3, 5)], (-1, 0), False, False),
+            ([(5, 5), (5, 6), (4, 6), (4, 5)], (-1, 0), True, False),
+            ([(5, 5), (5, 6), (4, 6), (4, 5)], (-1, 0), False, True),
+            ([(5, 5), (4, 5), (3, 5)], (0, 1), False, True),
+        ],
+        ids=["neck", "mid_body", "tail_while_growing", "tail_leaving", "clear_cell"],
+    )
+    def test_snake_self_collision(self, snake, body, direction, growing, expected_alive):
         """Test snake collision detection with its own body segments.
 
         Validates that when the snake's head moves into a position occupied by
         any part of its body, the collision is detected and the snake dies.
-        This is a core game over condition.
+        This is a core game over condition. The cell the tail is leaving is
+        the exception: unless the snake is growing, the tail moves out of
+        the way on the same tick.
 
         Collision detection logic:
-            - Check if new head position exists in body segments
-            - Exclude current head from collision check
+            - Look up the new head cell in the occupancy grid
+            - Ignore the current tail cell when not growing
             - Set alive flag to False on collision
 
-        Test setup:
-            - Create multi-segment snake: [(5,5), (4,5), (3,5)]
-            - Move left to position (2,5) - no collision
-            - Move left again to position (3,5) - collision with body
+        Scenarios:
+            - neck: head turns back into the segment behind it
+            - mid_body: head runs into a segment in the middle of the body
+            - tail_while_growing: head lands on the tail, which stays put
+            - tail_leaving: head lands on the tail as it moves away
+            - clear_cell: head moves onto an empty cell
 
         Assertions:
-            - Snake alive flag becomes False
-            - Collision properly detected
-            - Game over state triggered
+            - Snake alive flag matches the expected outcome
+            - A fatal move leaves the body and occupancy grid untouched
+            - A safe move adds the new head (dropping the tail unless growing)
+              and the occupancy grid matches the new body exactly
         """
-        snake = snake_game.Snake()
+        snake.body = deque(body)
+        snake.direction = direction
+        snake.next_direction = direction
+        snake.growing = growing
 
-        snake.body = deque([(5, 5), (4, 5), (3, 5)])
-        snake.direction = (-1, 0)
-        snake.next_direction = (-1, 0)
+        snake.move()
+
+        if expected_alive:
+            new_head = (body[0][0] + direction[0], body[0][1] + direction[1])
+            expected_body = [new_head] + (body if growing else body[:-1])
+        else:
+            expected_body = body
+        assert snake.alive is expected_alive
+        assert list(snake.body) == expected_body
+        assert occupied_cells(snake) == set(expected_body)
+
+    def test_snake_move_returns_vacated_cell(self, snake):
+        """Test that move() reports the cell freed by the tail.
+
+        Validates that the renderer can find out which cell to clear: a normal
+        move returns the old tail position, while a growing move keeps the
+        tail in place and returns None.
 
+        Assertions:
+            - Normal move returns the previous tail cell
+            - Growing move returns None
+        """
+        original_tail = snake.body[-1]
+
+        assert snake.move() == original_tail
+
+        snake.growing = True
+        assert snake.move() is None
+
+    def test_snake_grid_tracks_movement(self, snake):
+        """Test that the occupancy grid stays in sync with the body deque.
+
+        Validates that the grid marks the new head and clears the old tail on
+        a normal move, and keeps the tail marked while growing.
+
+        Assertions:
+            - Grid cells equal the body cells after a normal move
+            - Grid cells equal the body cells after a growing move
+        """
         snake.move()
+        assert occupied_cells(snake) == set(snake.body)
 
-        assert snake.alive is False
+        snake.growing = True
+        snake.move()
+        assert occupied_cells(snake) == set(snake.body)
+        assert len(occupied_cells(snake)) == 2
+
+    def test_move_n_equivalence(self, snake_game):
+        """Test that move_n matches the same sequence of single-tick moves.
 
-    def test_snake_no_movement_when_dead(self):
+        Validates that batching ticks through move_n leaves the snake in the
+        same state as calling change_direction() and move() once per tick,
+        including growth and the tick on which the snake dies.
+
+        Test scenario:
+            - Two snakes with identical four-segment bodies
+            - Growth on the first tick, then a run of turns that ends in a
+              self-collision
+
+        Assertions:
+            - Body, occupancy grid, direction and alive flag match
+            - move_n reports the number of ticks it ran
+            - Ticks after death are ignored
+        """
+        directions = [(0, 1), (-1, 0), (0, -1), (1, 0), (0, 1)]
+        batched = snake_game.Snake()
+        stepped = snake_game.Snake()
+        for snake in (batched, stepped):
+            snake.body = deque([(10, 10), (9, 10), (8, 10), (7, 10)])
+            snake.growing = True
+
+        ticks = batched.move_n(directions)
+        for direction in directions:
+            if not stepped.alive:
+                break
+            stepped.change_direction(direction)
+            stepped.move()
+
+        assert ticks == 3
+        assert batched.alive is stepped.alive is False
+        assert list(batched.body) == list(stepped.body)
+        assert occupied_cells(batched) == occupied_cells(stepped)
+        assert batched.direction == stepped.direction
+
+    def test_snake_no_movement_when_dead(self, snake):
         """Test that dead snake doesn't move or change state.
 
         Validates that when the snake's alive flag is False, calling move()
@@ -366,272 +448,367 @@ class TestSnake:
             - No position or direction changes
             - Dead state maintained
         """
-        snake = snake_game.Snake()
         snake.alive = False
-        original_body = list(snake.body)
+        original_body = snake.body.copy()
 
         snake.move()
 
-        assert list(snake.body) == original_body
+        assert snake.body == original_body
+
+    def test_snake_draw_batches_segments(self, snake, two_cell_body, snake_game):
+        """Test that the snake is drawn with a single batched blit call.
+
+        Validates that draw() hands every body segment to screen.blits() in
+        one call, reusing the pre-filled segment surface and the precomputed
+        cell rects, instead of issuing one draw call per segment.
+
+        Test setup:
+            - Snake body at positions: [(5,5), (4,5)]
+            - Screen replaced with a mock surface
+
+        Assertions:
+            - blits() called exactly once
+            - Each segment maps to its cell rect in CELL_RECTS
+            - Return rects are not requested (doreturn=0)
+        """
+        snake.body = two_cell_body
+        screen = MagicMock()
+
+        snake.draw(screen)
+
+        screen.blits.assert_called_once_with(
+            [
+                (snake._seg_surf, snake_game.CELL_RECTS[5][5]),
+                (snake._seg_surf, snake_game.CELL_RECTS[4][5]),
+            ],
+            doreturn=0,
+        )
 
 
 class TestFoodSpawning:
     """Test suite for food spawning functionality."""
 
-    @patch("snake_game.random.randint")
-    def test_spawn_food_empty_grid(self, mock_randint):
+    def test_spawn_food_empty_grid(self, snake, mock_randrange, snake_game):
         """Test food spawning on grid with available positions.
 
-        Validates that the spawn_food function correctly generates food at
-        random coordinates when there are available positions on the grid.
-        Uses mocking to control random number generation for deterministic testing.
+        Validates that the spawn_food function picks the food position from
+        the list of free cells using a single random index. Uses mocking to
+        control random number generation for deterministic testing.
 
         Mocking strategy:
-            - Mock random.randint to return predetermined coordinates
-            - First call returns x-coordinate (10)
-            - Second call returns y-coordinate (15)
+            - Mock random.randrange to return a predetermined slot (0)
 
         Test scenario:
-            - Snake occupies position (5, 5)
-            - Food should spawn at mocked position (10, 15)
-            - Position should not conflict with snake body
+            - Snake occupies position (20, 15)
+            - Every other grid cell is free
+            - Food should spawn at the first free cell (0, 0)
 
         Assertions:
-            - Food spawns at expected mocked coordinates
-            - Function returns correct tuple format
-            - No collision with existing snake body
+            - Food spawns at the free cell chosen by the mocked index
+            - randrange is drawn once over the number of free cells
         """
-        mock_randint.side_effect = [10, 15]
-
-        snake_body = deque([(5, 5)])
-        food_position = snake_game.spawn_food(snake_body)
+        food_position = snake_game.spawn_food(snake.free_cells)
 
-        assert food_position == (10, 15)
+        assert food_position == (0, 0)
+        mock_randrange.assert_called_once_with(
+            snake_game.GRID_WIDTH * snake_game.GRID_HEIGHT - 1
+        )
 
-    @patch("snake_game.random.randint")
-    def test_spawn_food_avoids_snake(self, mock_randint):
+    def test_spawn_food_avoids_snake(self, snake, two_cell_body, mock_randrange, snake_game):
         """Test that food spawning avoids collision with snake body segments.
 
-        Validates that the spawn_food function implements collision avoidance
-        by re-rolling random coordinates when they conflict with snake body
-        positions. This ensures food is always accessible to the player.
-
-        Collision avoidance logic:
-            - Generate random coordinates
-            - Check if position exists in snake body
-            - If collision detected, generate new coordinates
-            - Repeat until valid position found
+        Validates that the free-cell list never contains a snake segment, so
+        every index spawn_food can draw maps to a position the player can
+        reach. This ensures food is always accessible to the player.
 
         Test scenario:
             - Snake body at positions: [(5,5), (4,5)]
-            - First random attempt: (5,5) - collision with head
-            - Second random attempt: (10,15) - valid position
-
-        Mock sequence:
-            - Calls 1-2: Return (5,5) - conflicts with snake
-            - Calls 3-4: Return (10,15) - valid position
+            - Every slot of the free-cell list is sampled
 
         Assertions:
-            - Food spawns at valid non-conflicting position
-            - Collision avoidance mechanism works correctly
-            - Final position not in snake body
+            - Free-cell list excludes exactly the snake body
+            - Food never spawns on the snake body
         """
-        mock_randint.side_effect = [5, 5, 10, 15]
+        snake.body = two_cell_body
+        mock_randrange.side_effect = range(len(snake.free_cells))
 
-        snake_body = deque([(5, 5), (4, 5)])
-        food_position = snake_game.spawn_food(snake_body)
+        assert len(snake.free_cells) == snake_game.GRID_WIDTH * snake_game.GRID_HEIGHT - 2
+        for _ in range(len(snake.free_cells)):
+            assert snake_game.spawn_food(snake.free_cells) not in snake.body
 
-        assert food_position == (10, 15)
-        assert food_position not in snake_body
+    def test_spawn_food_nearly_full_board(self, snake, mock_randrange, snake_game):
+        """Test that food spawns with one draw when a single cell is left.
 
+        Validates that spawn_food does not degrade as the snake fills the
+        grid: with every cell but one covered, the free-cell list holds just
+        that cell and a single random index selects it.
 
-class TestHighScore:
-    """Test suite for high score functionality."""
+        Test scenario:
+            - Snake body covers every grid cell except (0, 0)
 
-    def test_load_high_score_file_exists(self):
-        """Test loading high score from existing file with valid content.
+        Assertions:
+            - Free-cell list contains only (0, 0)
+            - Food spawns at (0, 0)
+            - randrange is drawn exactly once
+        """
+        snake.body = deque(cell for cell in snake_game.ALL_CELLS if cell != (0, 0))
 
-        Validates that the load_high_score function correctly reads and parses
-        a high score value from the highscore.txt file when it exists and
-        contains valid integer data.
+        assert snake.free_cells == [(0, 0)]
+        assert snake_game.spawn_food(snake.free_cells) == (0, 0)
+        mock_randrange.assert_called_once_with(1)
 
-        File I/O mocking:
-            - Mock file open operation
-            - Provide valid integer string content ("42")
-            - Simulate successful file read
+    def test_spawn_food_full_board(self, snake_game):
+        """Test that spawning food on a full board raises instead of looping.
 
-        Expected behavior:
-            - File opened in read mode
-            - Content parsed as integer
-            - Parsed value returned
+        Validates that spawn_food fails fast when no free cell remains,
+        rather than retrying random positions forever.
 
-        Test verification:
-            - Function returns correct integer value
-            - File reading mechanism works properly
-            - String-to-integer conversion successful
+        Assertions:
+            - ValueError raised for an empty free-cell list
+        """
+        with pytest.raises(ValueError):
+            snake_game.spawn_food([])
+
+    def test_free_cells_track_movement(self, snake, snake_game):
+        """Test that the free-cell list stays in sync as the snake moves and grows.
+
+        Validates the swap-remove bookkeeping: the new head leaves the free
+        list, the vacated tail rejoins it, and every cell's slot index points
+        back at its position in the list.
 
         Assertions:
-            - Returned score matches file content (42)
-            - No exceptions raised during operation
+            - Free cells are exactly the grid cells not covered by the body
+            - Slot index matches list positions after each move
         """
-        mock_file_content = "42"
+        all_cells = set(snake_game.ALL_CELLS)
+
+        for growing in (False, True, True, False):
+            snake.growing = growing
+            snake.move()
 
-        with patch("builtins.open", mock_open(read_data=mock_file_content)):
-            score = snake_game.load_high_score()
-            assert score == 42
+            assert set(snake.free_cells) == all_cells - set(snake.body)
+            assert len(snake.free_cells) == len(all_cells) - len(snake.body)
+            for slot, cell in enumerate(snake.free_cells):
+                assert snake._free_slots[cell] == slot
 
-    def test_load_high_score_file_not_exists(self):
-        """Test loading high score when highscore.txt file doesn't exist.
 
-        Validates that the load_high_score function gracefully handles the
-        case where the high score file hasn't been created yet (first run
-        scenario). Should return default value without crashing.
+class TestHighScore:
+    """Test suite for high score functionality."""
 
-        Error handling:
-            - FileNotFoundError exception caught
-            - Default value (0) returned
-            - No error propagated to caller
+    @pytest.fixture(autouse=True)
+    def clear_high_score_cache(self, monkeypatch, snake_game):
+        """Start every test with no cached high score so the file is read."""
+        monkeypatch.setattr(snake_game, "_high_score", None)
 
-        First-run scenario:
-            - Game launched for first time
-            - No previous high score recorded
-            - Function should provide sensible default
+    @pytest.fixture
+    def highscore_file(self, request, tmp_path, monkeypatch, snake_game):
+        """Point HIGHSCORE_PATH at a temporary file holding request.param.
 
-        Exception mocking:
-            - Mock file open to raise FileNotFoundError
-            - Simulate missing file condition
-            - Test exception handling path
+        A param of None leaves the file out entirely.
+        """
+        path = tmp_path / "highscore.txt"
+        if request.param is not None:
+            path.write_text(request.param)
+        monkeypatch.setattr(snake_game, "HIGHSCORE_PATH", str(path))
+        return path
+
+    @pytest.mark.parametrize(
+        "highscore_file,expected",
+        [("42", 42), (None, 0), ("invalid", 0)],
+        ids=["file_exists", "file_not_exists", "invalid_content"],
+        indirect=["highscore_file"],
+    )
+    def test_load_high_score(self, highscore_file, expected, snake_game):
+        """Test loading the high score from highscore.txt.
+
+        Validates that the load_high_score function parses a stored integer,
+        and degrades gracefully to 0 both on first run, when the file has
+        not been created yet, and when the file holds corrupted or manually
+        edited content.
+
+        Cases:
+            - "42": content parsed as integer and returned
+            - No file: FileNotFoundError caught, default 0 returned
+            - "invalid": ValueError from int() caught, default 0 returned
 
         Assertions:
-            - Function returns 0 as default value
-            - No exceptions escape function
-            - Graceful degradation behavior
+            - Returned score matches the expected value
+            - No exceptions escape the function
         """
-        with patch("builtins.open", side_effect=FileNotFoundError):
-            score = snake_game.load_high_score()
-            assert score == 0
+        assert snake_game.load_high_score() == expected
+
+    @pytest.mark.parametrize("highscore_file", [None], indirect=True)
+    def test_save_high_score(self, highscore_file, snake_game):
+        """Test saving high score value to persistent storage file.
 
-    def test_load_high_score_invalid_content(self):
-        """Test loading high score when file contains invalid/corrupted data.
+        Validates that the save_high_score function correctly writes the
+        high score value to the high score file for persistence across game
+        sessions. The file lives in a temporary directory, so the test checks
+        what ends up on disk rather than how it was written.
 
-        Validates that the load_high_score function handles corrupted or
-        invalid file content gracefully by returning a default value instead
-        of crashing. This covers scenarios like file corruption or manual editing.
+        Test procedure:
+            1. Point HIGHSCORE_PATH at a file that does not exist yet
+            2. Call save_high_score with test value (100)
+            3. Read the file back
 
-        Invalid content scenarios:
-            - Non-numeric strings ("invalid", "abc")
-            - Empty files
-            - Files with special characters
-            - Partially corrupted data
+        Assertions:
+            - File created with the score written as a string
+        """
+        snake_game.save_high_score(100)
 
-        Error handling:
-            - ValueError exception caught during int() conversion
-            - Default value (0) returned
-            - No error propagated to caller
+        assert highscore_file.read_text() == "100"
+
+    @pytest.mark.parametrize("highscore_file", ["42"], indirect=True)
+    def test_load_high_score_cached(self, highscore_file, snake_game):
+        """Test that the high score file is read only once.
+
+        Validates that load_high_score memoizes the parsed value, so later
+        calls return it without touching the file system again.
 
         Test setup:
-            - Mock file with invalid content ("invalid")
-            - Simulate int() conversion failure
-            - Verify graceful fallback behavior
+            - Write "42" to highscore.txt and load it
+            - Overwrite the file with "7" and load again
 
         Assertions:
-            - Function returns 0 for invalid content
-            - Exception handling prevents crashes
-            - Robust error recovery implemented
+            - Both calls return the first value read (42)
+            - The file is opened exactly once
         """
-        mock_file_content = "invalid"
+        with patch.object(snake_game.os, "open", wraps=snake_game.os.open) as spy_open:
+            assert snake_game.load_high_score() == 42
+            highscore_file.write_text("7")
+            assert snake_game.load_high_score() == 42
 
-        with patch("builtins.open", mock_open(read_data=mock_file_content)):
-            score = snake_game.load_high_score()
-            assert score == 0
+        assert spy_open.call_count == 1
 
-    def test_save_high_score(self):
-        """Test saving high score value to persistent storage file.
+    @pytest.mark.parametrize("highscore_file", [None], indirect=True)
+    def test_save_high_score_skips_unchanged(self, highscore_file, snake_game):
+        """Test that saving the score already on disk does not rewrite the file.
 
-        Validates that the save_high_score function correctly writes the
-        high score value to the highscore.txt file for persistence across
-        game sessions. Uses mocking to verify file operations without
-        actual file system interaction.
+        Test setup:
+            - Save 100, then change the file behind the game's back
+            - Save 100 again, then save 120
 
-        File I/O operations:
-            - Open highscore.txt in write mode
-            - Convert integer score to string
-            - Write string content to file
-            - File automatically closed
+        Assertions:
+            - The repeated save of 100 leaves the file alone
+            - A different score is written again
+        """
+        snake_game.save_high_score(100)
+        highscore_file.write_text("changed")
 
-        Mocking verification:
-            - File opened with correct parameters
-            - Write operation called with correct data
-            - Proper file handling implemented
+        snake_game.save_high_score(100)
+        assert highscore_file.read_text() == "changed"
+
+        snake_game.save_high_score(120)
+        assert highscore_file.read_text() == "120"
 
-        Test procedure:
-            1. Mock file operations
-            2. Call save_high_score with test value (100)
-            3. Verify file opened in write mode
-            4. Verify correct content written
+
+class TestTextRendering:
+    """Test suite for cached text rendering."""
+
+    def test_render_text_caches_surface(self, snake_game):
+        """Test that static text is rasterized once and reused afterwards.
+
+        Validates that render_text only calls font.render the first time a
+        string is requested and returns the cached surface on later calls,
+        so menu and game-over labels are not re-rendered every frame.
 
         Assertions:
-            - File opened with correct filename and mode
-            - Score value written as string
-            - File operations called exactly once
+            - Repeated calls return the same surface object
+            - font.render called exactly once per distinct string
         """
-        mock_file = mock_open()
+        font = MagicMock()
 
-        with patch("builtins.open", mock_file):
-            snake_game.save_high_score(100)
+        with patch.dict(snake_game.TEXT_CACHE, clear=True):
+            first = snake_game.render_text(font, "Game Over!")
+            second = snake_game.render_text(font, "Game Over!")
 
-        mock_file.assert_called_once_with("highscore.txt", "w")
-        mock_file().write.assert_called_once_with("100")
+        assert first is second
+        font.render.assert_called_once_with("Game Over!", snake_game.WHITE)
 
 
 class TestGameIntegration:
     """Integration tests for game components working together."""
 
-    def test_snake_eating_food_integration(self):
-        """Test integration of snake growth mechanism when eating food.
+    def test_step_eats_food(self, snake, mock_randrange, snake_game):
+        """Test a headless game tick in which the snake reaches the food.
+
+        Validates that step() moves the snake, flags it to grow once its head
+        lands on the food, and places new food on a free cell, all without
+        touching the display.
+
+        Test setup:
+            - Food placed directly in front of the snake's head
+            - random.randrange mocked to pick the first free cell
 
-        Validates the complete food consumption workflow including snake
-        growth, length tracking, and state management. This integration
-        test ensures all components work together correctly.
+        Assertions:
+            - Vacated tail cell is reported
+            - Snake is flagged to grow on its next move
+            - New food is placed at the first free cell
+        """
+        start = snake.body[0]
+        food_position = (start[0] + 1, start[1])
 
-        Food eating workflow:
-            1. Snake head moves to food position
-            2. Collision detection triggers
-            3. Growing flag set to True
-            4. Next move() call increases length
-            5. Growing flag reset to False
+        vacated, new_food_position = snake_game.step(snake, food_position)
 
-        Integration components:
-            - Snake movement system
-            - Growth mechanism
-            - Length tracking
-            - State flag management
+        assert vacated == start
+        assert snake.body[0] == food_position
+        assert snake.growing is True
+        assert new_food_position == (0, 0)
 
-        Test simulation:
-            - Set growing flag (simulates food collision)
-            - Call move() to trigger growth
-            - Verify length increase and flag reset
+    def test_step_without_food(self, snake, snake_game):
+        """Test a headless game tick that does not reach the food.
 
         Assertions:
-            - Snake length increases by exactly 1
-            - Length counter updated correctly
-            - Growing flag properly reset
-            - Integration between systems works
+            - Snake moves one cell right and reports its old tail as vacated
+            - Snake does not grow
+            - Food position is returned unchanged
         """
-        snake = snake_game.Snake()
+        start = snake.body[0]
+        start_tail = snake.body[-1]
+        food_position = (0, 0)
 
-        next_pos = (snake.body[0][0] + 1, snake.body[0][1])
+        vacated, new_food_position = snake_game.step(snake, food_position)
 
+        assert vacated == start_tail
+        assert snake.body[0] == (start[0] + 1, start[1])
+        assert snake.growing is False
+        assert new_food_position == food_position
+
+    def test_step_fills_board(self, snake, snake_game):
+        """Test a headless tick in which the snake eats the last free cell.
+
+        Validates that step() ends the round as a win instead of trying to
+        spawn food on a full board, which would raise ValueError.
+
+        Test setup:
+            - Snake covers every cell except (0, 0), head at (1, 0) moving left
+            - Snake is growing from the previous meal, food at (0, 0)
+
+        Assertions:
+            - The snake fills the whole board and no cell is free
+            - The final meal is still counted toward the score
+            - The round ends (alive is False) with no food position
+        """
+        cell_count = snake_game.GRID_WIDTH * snake_game.GRID_HEIGHT
+        body = [cell for cell in snake_game.ALL_CELLS if cell not in ((0, 0), (1, 0))]
+        snake.body = deque([(1, 0)] + body)
+        snake.length = cell_count - 1
+        snake.direction = (-1, 0)
+        snake.next_direction = (-1, 0)
         snake.growing = True
-        original_length = len(snake.body)
 
-        snake.move()
+        vacated, new_food_position = snake_game.step(snake, (0, 0))
 
-        assert len(snake.body) == original_length + 1
-        assert snake.length == original_length + 1
-        assert snake.growing is False
+        assert vacated is None
+        assert len(snake.body) == cell_count
+        assert snake.free_cells == []
+        # The growing move adds one segment and the final meal still scores one more
+        assert snake.length == cell_count + 1
+        assert snake.alive is False
+        assert new_food_position is None
 
-    def test_difficulty_settings_integration(self):
+    @pytest.mark.parametrize("difficulty,expected_fps", list(EXPECTED_DIFFICULTIES.items()))
+    def test_difficulty_settings_integration(self, snake, snake_game, difficulty, expected_fps):
         """Test integration between Snake class and global difficulty settings.
 
         Validates that the Snake class properly integrates with the global
@@ -646,16 +823,15 @@ class TestGameIntegration:
             - Difficulty selection mechanism
 
         Test coverage:
-            - All difficulty levels (Easy, Medium, Hard)
+            - All difficulty levels (Easy, Medium, Hard), one case each
             - Difficulty assignment to snake
             - FPS value accessibility
             - Consistency between systems
 
         Test procedure:
-            1. Iterate through all difficulty levels
-            2. Assign each difficulty to snake
-            3. Verify assignment successful
-            4. Verify FPS value accessible
+            1. Assign the parametrized difficulty to snake
+            2. Verify assignment successful
+            3. Verify FPS value accessible
 
         Assertions:
             - Snake difficulty properly set
@@ -663,13 +839,6 @@ class TestGameIntegration:
             - All difficulty levels supported
             - Integration maintains consistency
         """
-        snake = snake_game.Snake()
-
-        for difficulty, expected_fps in snake_game.DIFFICULTIES.items():
-            snake.difficulty = difficulty
-            assert snake.difficulty == difficulty
-            assert snake_game.DIFFICULTIES[difficulty] == expected_fps
-
-
-if __name__ == "__main__":
-    pytest.main([__file__])
+        snake.difficulty = difficulty
+        assert snake.difficulty == difficulty
+        assert snake_game.DIFFICULTIES[difficulty] == expected_fps